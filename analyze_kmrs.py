@@ -4,19 +4,136 @@ Analyseur automatique du fichier KMRS.xlsm
 Extrait structure, données, formules et logique métier
 """
 
+import argparse
+import io
 import re
 import json
 import zipfile
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import IO, Dict, Iterator, List, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# lxml (optionnel) fournit un iterparse plus rapide, même API que la stdlib
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
+
+# orjson (optionnel) pour une sérialisation JSON native
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Espace de noms SpreadsheetML des feuilles (notation Clark pour ElementTree)
+_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_C_TAG = f'{{{_NS}}}c'
+_F_TAG = f'{{{_NS}}}f'
+_V_TAG = f'{{{_NS}}}v'
+_ROW_TAG = f'{{{_NS}}}row'
+_SHEETS_TAG = f'{{{_NS}}}sheets'
+
+# Avec lxml, le filtrage des balises se fait côté C et les très grandes feuilles sont acceptées
+_SHEET_ITERPARSE_OPTIONS = {'tag': (_C_TAG, _ROW_TAG), 'huge_tree': True} if _HAS_LXML else {}
+
+# Partie contenant les macros d'un classeur .xlsm
+_VBA_PROJECT = 'xl/vbaProject.bin'
+
+_COLUMN_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Types de cellule, indexés par position dans les compteurs de feuille
+_CELL_TYPES = ('text', 'number', 'formula', 'empty')
+_TEXT, _NUMBER, _FORMULA, _EMPTY = range(len(_CELL_TYPES))
+_KNOWN_FORMULAS = frozenset({'SUM', 'AVERAGE', 'IF', 'VLOOKUP', 'MAX', 'MIN'})
+# Mots-clés cherchés n'importe où dans la formule, par ordre de priorité
+# (les fonctions sont souvent imbriquées, ex: IFERROR(AVERAGE(...)))
+_CALCULATION_TYPES = (
+    ('SUM', 'Somme de valeurs'),
+    ('AVERAGE', 'Calcul de moyenne'),
+    ('IF', 'Logique conditionnelle'),
+    ('MAX', 'Recherche d\'extrema'),
+    ('MIN', 'Recherche d\'extrema'),
+    ('VLOOKUP', 'Recherche de données'),
+)
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+
+
+def _column_letters(column: int) -> str:
+    """Lettres d'une colonne d'après son numéro (ex: 28 -> 'AB')"""
+    letters = ''
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = _COLUMN_LETTERS[remainder] + letters
+    return letters
+
+
+def _column_number(cell_ref: str) -> int:
+    """Numéro de colonne d'une référence de cellule (ex: 'AB12' -> 28)"""
+    column = 0
+    for letter in cell_ref.rstrip('0123456789'):
+        column = column * 26 + _COLUMN_LETTERS.index(letter) + 1
+    return column
+
+
+def _iter_cells(stream: IO[bytes]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Parcourt une feuille en flux et produit (référence, formule, valeur) pour chaque cellule"""
+    # Les attributs r de <row> et <c> sont optionnels : sans eux, la position
+    # se déduit de la ligne englobante et de la cellule précédente
+    row_number = column = 0
+    for event, elem in ET.iterparse(stream, events=('start', 'end'), **_SHEET_ITERPARSE_OPTIONS):
+        if elem.tag == _C_TAG:
+            if event == 'start':
+                continue
+            cell_ref = elem.get('r')
+            if cell_ref:
+                column = _column_number(cell_ref)
+            else:
+                column += 1
+                cell_ref = f"{_column_letters(column)}{row_number}"
+            formula = elem.findtext(_F_TAG)
+            value = elem.findtext(_V_TAG)
+            yield cell_ref, formula or None, value or None
+            elem.clear()
+        elif elem.tag == _ROW_TAG:
+            if event == 'start':
+                row_ref = elem.get('r')
+                row_number = int(row_ref) if row_ref else row_number + 1
+                column = 0
+            else:
+                elem.clear()
+
+
+def _row_number(cell_ref: str) -> int:
+    """Numéro de ligne d'une référence de cellule (ex: 'AB12' -> 12)"""
+    return int(cell_ref.lstrip(_COLUMN_LETTERS))
+
+
+def _formula_type(formula: str) -> str:
+    """Type principal d'une formule d'après sa fonction de tête"""
+    head = formula.partition('(')[0]
+    return head if head in _KNOWN_FORMULAS else 'OTHER'
+
+
+def _sheet_name(sheet_names: List[str], sheet_number: int) -> str:
+    """Nom de la feuille d'après workbook.xml, ou nom par défaut"""
+    return sheet_names[sheet_number - 1] if sheet_number <= len(sheet_names) else f"Sheet{sheet_number}"
+
+
+def _analyze_sheet_bytes(data: bytes, sheet_number: int, sheet_name: str) -> Dict[str, Any]:
+    """Point d'entrée des processus de travail : analyse une feuille déjà extraite"""
+    return KMRSAnalyzer._analyze_worksheet_content(io.BytesIO(data), sheet_number, sheet_name)
+
+
 class KMRSAnalyzer:
     """Analyseur complet du fichier KMRS.xlsm"""
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_workers: int = 1):
         self.file_path = Path(file_path)
+        # Au-delà d'un worker, les feuilles sont analysées en parallèle (processus)
+        self.max_workers = max_workers
         self.analysis_result = {
             'metadata': {},
             'sheets': [],
@@ -26,6 +143,15 @@ class KMRSAnalyzer:
             'business_logic': {},
             'recommendations': []
         }
+        # Analyse paresseuse : les feuilles ne sont lues qu'à la demande
+        self._worksheet_files: List[str] = []
+        self._metadata_done = False
+        self._deep_done = False
+        self._zip_file: Optional[zipfile.ZipFile] = None
+        # Calculs préparés par _analyze_formulas pour la logique métier
+        self._calculations: List[Dict[str, Any]] = []
+        # Horodatage unique de l'analyse (métadonnées et nom du fichier de sortie)
+        self._analysis_time = datetime.now()
         
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du fichier KMRS"""
@@ -33,9 +159,8 @@ class KMRSAnalyzer:
         
         try:
             # Analyser le fichier Excel (format ZIP)
-            self._analyze_excel_structure()
-            self._extract_worksheets()
-            self._analyze_formulas()
+            self.analyze_metadata()
+            self.analyze_sheets()
             self._identify_business_logic()
             self._generate_recommendations()
             
@@ -48,45 +173,96 @@ class KMRSAnalyzer:
             self._fallback_analysis()
             return self.analysis_result
     
+    def analyze_metadata(self) -> Dict[str, Any]:
+        """Analyse légère : métadonnées de l'archive et noms des feuilles"""
+        if not self._metadata_done:
+            try:
+                self._analyze_excel_structure()
+            finally:
+                self._close_archive()
+            self._metadata_done = True
+        return self.analysis_result['metadata']
+    
+    def analyze_sheets(self) -> List[Dict[str, Any]]:
+        """Analyse approfondie des feuilles et des formules, exécutée une seule fois"""
+        if not self._deep_done:
+            self.analyze_metadata()
+            try:
+                self._analyze_worksheets_xml(self._worksheet_files)
+            finally:
+                self._close_archive()
+            self._extract_worksheets()
+            self._analyze_formulas()
+            self._deep_done = True
+        return self.analysis_result['sheets']
+    
+    def _archive(self) -> zipfile.ZipFile:
+        """Archive .xlsm ouverte une seule fois par passe d'analyse"""
+        if self._zip_file is None:
+            self._zip_file = zipfile.ZipFile(self.file_path, 'r')
+        return self._zip_file
+    
+    def _open_member(self, name: str) -> IO[bytes]:
+        """Ouvre un membre de l'archive en flux binaire, décompressé à la volée"""
+        return self._archive().open(name)
+    
+    def _close_archive(self):
+        """Ferme l'archive à la fin d'une passe"""
+        if self._zip_file is not None:
+            self._zip_file.close()
+            self._zip_file = None
+    
     def _analyze_excel_structure(self):
         """Analyse la structure du fichier Excel"""
         print("📊 Analyse de la structure Excel...")
         
         try:
-            with zipfile.ZipFile(self.file_path, 'r') as zip_file:
-                file_list = zip_file.namelist()
-                
-                # Métadonnées de base
-                self.analysis_result['metadata'] = {
-                    'filename': self.file_path.name,
-                    'size_bytes': self.file_path.stat().st_size,
-                    'analysis_date': datetime.now().isoformat(),
-                    'excel_files': [f for f in file_list if f.endswith('.xml')],
-                    'has_macros': any('vba' in f.lower() for f in file_list),
-                    'total_files': len(file_list)
-                }
-                
-                # Chercher le fichier de workbook
-                workbook_files = [f for f in file_list if 'workbook' in f.lower()]
-                if workbook_files:
-                    self._analyze_workbook_xml(zip_file, workbook_files[0])
-                
-                # Chercher les feuilles
-                worksheet_files = [f for f in file_list if f.startswith('xl/worksheets/')]
-                self._analyze_worksheets_xml(zip_file, worksheet_files)
-                
+            file_list = self._archive().namelist()
+            
+            # Classer les fichiers de l'archive en une seule passe
+            xml_files = []
+            worksheet_files = []
+            workbook_path = None
+            for name in file_list:
+                if name.endswith('.xml'):
+                    xml_files.append(name)
+                    if name.startswith('xl/worksheets/'):
+                        worksheet_files.append(name)
+                if workbook_path is None and 'workbook' in name.lower():
+                    workbook_path = name
+            
+            # Métadonnées de base
+            self.analysis_result['metadata'] = {
+                'filename': self.file_path.name,
+                'size_bytes': self.file_path.stat().st_size,
+                'analysis_date': self._analysis_time.isoformat(),
+                'excel_files': xml_files,
+                'has_macros': _VBA_PROJECT in file_list,
+                'total_files': len(file_list)
+            }
+            
+            # Chercher le fichier de workbook
+            if workbook_path:
+                self._analyze_workbook_xml(workbook_path)
+            
+            # Les feuilles sont analysées à la demande par analyze_sheets()
+            self._worksheet_files = worksheet_files
+            
         except Exception as e:
             print(f"⚠️ Erreur structure Excel: {e}")
             self.analysis_result['metadata']['error'] = str(e)
     
-    def _analyze_workbook_xml(self, zip_file: zipfile.ZipFile, workbook_path: str):
+    def _analyze_workbook_xml(self, workbook_path: str):
         """Analyse le fichier workbook.xml"""
         try:
-            with zip_file.open(workbook_path) as workbook_file:
-                content = workbook_file.read().decode('utf-8')
+            with self._open_member(workbook_path) as workbook_file:
+                # Lire uniquement le bloc <sheets>, sans charger tout le workbook
+                sheet_names = []
+                for _, elem in ET.iterparse(workbook_file, events=('end',)):
+                    if elem.tag == _SHEETS_TAG:
+                        sheet_names = [sheet.get('name') for sheet in elem]
+                        break
                 
-                # Extraire les noms des feuilles avec regex
-                sheet_names = re.findall(r'name="([^"]+)"', content)
                 self.analysis_result['metadata']['sheet_names'] = sheet_names
                 self.analysis_result['metadata']['sheet_count'] = len(sheet_names)
                 
@@ -95,103 +271,128 @@ class KMRSAnalyzer:
         except Exception as e:
             print(f"⚠️ Erreur workbook: {e}")
     
-    def _analyze_worksheets_xml(self, zip_file: zipfile.ZipFile, worksheet_files: List[str]):
+    def _analyze_worksheets_xml(self, worksheet_files: List[str]):
         """Analyse les fichiers de feuilles"""
         print("📄 Analyse des feuilles...")
         
+        sheet_names = self.analysis_result['metadata'].get('sheet_names') or []
+        
+        if self.max_workers > 1 and len(worksheet_files) > 1:
+            self._analyze_worksheets_parallel(worksheet_files, sheet_names)
+            return
+        
         for i, worksheet_file in enumerate(worksheet_files):
             try:
-                with zip_file.open(worksheet_file) as sheet_file:
-                    content = sheet_file.read().decode('utf-8')
-                    
-                    sheet_analysis = self._analyze_worksheet_content(content, i + 1)
+                with self._open_member(worksheet_file) as sheet_file:
+                    sheet_analysis = self._analyze_worksheet_content(sheet_file, i + 1, _sheet_name(sheet_names, i + 1))
                     self.analysis_result['sheets'].append(sheet_analysis)
                     
             except Exception as e:
                 print(f"⚠️ Erreur feuille {worksheet_file}: {e}")
     
-    def _analyze_worksheet_content(self, content: str, sheet_number: int) -> Dict[str, Any]:
+    def _analyze_worksheets_parallel(self, worksheet_files: List[str], sheet_names: List[str]):
+        """Analyse les feuilles dans un pool de processus (l'archive reste lue ici)"""
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for i, worksheet_file in enumerate(worksheet_files):
+                # Une feuille illisible est signalée et ignorée, comme en séquentiel
+                try:
+                    with self._open_member(worksheet_file) as sheet_file:
+                        data = sheet_file.read()
+                except Exception as e:
+                    print(f"⚠️ Erreur feuille {worksheet_file}: {e}")
+                    continue
+                futures.append((worksheet_file, executor.submit(_analyze_sheet_bytes, data, i + 1, _sheet_name(sheet_names, i + 1))))
+            
+            for worksheet_file, future in futures:
+                try:
+                    self.analysis_result['sheets'].append(future.result())
+                except Exception as e:
+                    print(f"⚠️ Erreur feuille {worksheet_file}: {e}")
+    
+    @staticmethod
+    def _analyze_worksheet_content(stream: IO[bytes], sheet_number: int, sheet_name: str) -> Dict[str, Any]:
         """Analyse le contenu d'une feuille"""
-        sheet_name = self.analysis_result['metadata'].get('sheet_names', [])[sheet_number - 1] if sheet_number <= len(self.analysis_result['metadata'].get('sheet_names', [])) else f"Sheet{sheet_number}"
+        # Analyser les données en une seule passe (types, formules et zones)
+        preview = []
+        total_cells = 0
+        formulas = []
+        formula_types = Counter()
+        type_counts = [0] * len(_CELL_TYPES)
+        header_count = data_count = 0
+        header_refs = []
+        data_refs = []
         
-        # Extraire les cellules avec valeurs
-        cell_pattern = r'<c r="([A-Z]+\d+)"[^>]*>(?:<f[^>]*>([^<]+)</f>)?(?:<v>([^<]+)</v>)?</c>'
-        cells = re.findall(cell_pattern, content)
+        # Références locales : évite les recherches d'attributs dans la boucle chaude
+        is_number = _NUM_RE.fullmatch
+        add_formula = formulas.append
         
-        # Analyser les données
-        cell_data = []
-        formulas = []
-        data_types = {'text': 0, 'number': 0, 'formula': 0, 'empty': 0}
-        
-        for cell_ref, formula, value in cells:
-            cell_info = {
-                'reference': cell_ref,
-                'value': value if value else None,
-                'formula': formula if formula else None,
-                'type': 'formula' if formula else ('number' if value and value.replace('.', '').isdigit() else 'text')
-            }
-            cell_data.append(cell_info)
-            
+        for cell_ref, formula, value in _iter_cells(stream):
             if formula:
-                formulas.append({'cell': cell_ref, 'formula': formula})
-                data_types['formula'] += 1
+                type_index = _FORMULA
+                add_formula({'cell': cell_ref, 'formula': formula})
+                formula_types[_formula_type(formula)] += 1
             elif value:
-                if value.replace('.', '').isdigit():
-                    data_types['number'] += 1
-                else:
-                    data_types['text'] += 1
+                type_index = _NUMBER if is_number(value) else _TEXT
             else:
-                data_types['empty'] += 1
+                type_index = _EMPTY
+            
+            total_cells += 1
+            type_counts[type_index] += 1
+            
+            # Seul un aperçu des cellules est conservé dans le résultat
+            if len(preview) < 50:
+                preview.append({
+                    'reference': cell_ref,
+                    'value': value,
+                    'formula': formula,
+                    'type': _CELL_TYPES[type_index]
+                })
+            
+            # Zones : en-têtes (3 premières lignes) puis données
+            if _row_number(cell_ref) <= 3:
+                header_count += 1
+                if len(header_refs) < 10:
+                    header_refs.append(cell_ref)
+            else:
+                data_count += 1
+                if len(data_refs) < 10:
+                    data_refs.append(cell_ref)
         
-        # Identifier les zones de données
-        zones = self._identify_data_zones(cell_data)
+        zones = []
+        if header_count:
+            zones.append({
+                'type': 'headers',
+                'description': 'Zone d\'en-têtes et titres',
+                'cells': header_count,
+                'references': header_refs
+            })
+        if data_count:
+            zones.append({
+                'type': 'data',
+                'description': 'Zone de données principales',
+                'cells': data_count,
+                'references': data_refs
+            })
         
         return {
             'name': sheet_name,
             'number': sheet_number,
-            'total_cells': len(cell_data),
-            'data_types': data_types,
+            'total_cells': total_cells,
+            'data_types': dict(zip(_CELL_TYPES, type_counts)),
             'formulas': formulas,
+            'formula_types': dict(formula_types),
             'data_zones': zones,
-            'cells': cell_data[:50],  # Limiter pour la lisibilité
+            'cells': preview,
             'analysis': {
                 'has_formulas': len(formulas) > 0,
                 'complexity': 'high' if len(formulas) > 10 else 'medium' if len(formulas) > 3 else 'low',
-                'purpose': self._infer_sheet_purpose(sheet_name, formulas, cell_data)
+                'purpose': KMRSAnalyzer._infer_sheet_purpose(sheet_name, formulas)
             }
         }
     
-    def _identify_data_zones(self, cell_data: List[Dict]) -> List[Dict]:
-        """Identifie les zones logiques de données"""
-        if not cell_data:
-            return []
-        
-        # Grouper par proximité
-        zones = []
-        
-        # Zone d'en-têtes (premières lignes)
-        header_cells = [c for c in cell_data if int(re.search(r'\d+', c['reference']).group()) <= 3]
-        if header_cells:
-            zones.append({
-                'type': 'headers',
-                'description': 'Zone d\'en-têtes et titres',
-                'cells': len(header_cells),
-                'references': [c['reference'] for c in header_cells[:10]]
-            })
-        
-        # Zone de données (lignes suivantes)
-        data_cells = [c for c in cell_data if int(re.search(r'\d+', c['reference']).group()) > 3]
-        if data_cells:
-            zones.append({
-                'type': 'data',
-                'description': 'Zone de données principales',
-                'cells': len(data_cells),
-                'references': [c['reference'] for c in data_cells[:10]]
-            })
-        
-        return zones
-    
-    def _infer_sheet_purpose(self, sheet_name: str, formulas: List, cell_data: List) -> str:
+    @staticmethod
+    def _infer_sheet_purpose(sheet_name: str, formulas: List) -> str:
         """Infère le but de la feuille"""
         name_lower = sheet_name.lower()
         
@@ -228,32 +429,29 @@ class KMRSAnalyzer:
         print("🧮 Analyse des formules...")
         
         all_formulas = []
-        formula_types = {}
+        calculations = []
+        formula_types = Counter()
         
+        # Les types sont déjà comptés par feuille pendant la lecture des cellules ;
+        # les calculs de la logique métier sont préparés dans le même parcours
         for sheet in self.analysis_result['sheets']:
+            sheet_name = sheet['name']
             for formula_info in sheet.get('formulas', []):
                 formula = formula_info['formula']
                 all_formulas.append(formula)
-                
-                # Analyser le type de formule
-                if formula.startswith('SUM('):
-                    formula_types['SUM'] = formula_types.get('SUM', 0) + 1
-                elif formula.startswith('AVERAGE('):
-                    formula_types['AVERAGE'] = formula_types.get('AVERAGE', 0) + 1
-                elif formula.startswith('IF('):
-                    formula_types['IF'] = formula_types.get('IF', 0) + 1
-                elif formula.startswith('VLOOKUP('):
-                    formula_types['VLOOKUP'] = formula_types.get('VLOOKUP', 0) + 1
-                elif formula.startswith('MAX('):
-                    formula_types['MAX'] = formula_types.get('MAX', 0) + 1
-                elif formula.startswith('MIN('):
-                    formula_types['MIN'] = formula_types.get('MIN', 0) + 1
-                else:
-                    formula_types['OTHER'] = formula_types.get('OTHER', 0) + 1
+                calculations.append({
+                    'sheet': sheet_name,
+                    'cell': formula_info['cell'],
+                    'formula': formula,
+                    'type': self._classify_calculation(formula)
+                })
+            formula_types.update(sheet.get('formula_types', {}))
+        
+        self._calculations = calculations
         
         self.analysis_result['formulas'] = {
             'total_count': len(all_formulas),
-            'types': formula_types,
+            'types': dict(formula_types),
             'complexity': 'high' if len(all_formulas) > 50 else 'medium' if len(all_formulas) > 15 else 'low',
             'sample_formulas': all_formulas[:10]
         }
@@ -264,7 +462,7 @@ class KMRSAnalyzer:
         
         business_logic = {
             'workflow_steps': [],
-            'calculations': [],
+            'calculations': self._calculations,
             'data_flow': [],
             'user_interactions': []
         }
@@ -281,83 +479,64 @@ class KMRSAnalyzer:
             }
             business_logic['workflow_steps'].append(step)
         
-        # Identifier les calculs principaux
-        for sheet in self.analysis_result['sheets']:
-            for formula_info in sheet.get('formulas', []):
-                business_logic['calculations'].append({
-                    'sheet': sheet['name'],
-                    'cell': formula_info['cell'],
-                    'formula': formula_info['formula'],
-                    'type': self._classify_calculation(formula_info['formula'])
-                })
-        
         self.analysis_result['business_logic'] = business_logic
     
     def _classify_calculation(self, formula: str) -> str:
         """Classifie le type de calcul"""
-        if 'SUM' in formula:
-            return 'Somme de valeurs'
-        elif 'AVERAGE' in formula:
-            return 'Calcul de moyenne'
-        elif 'IF' in formula:
-            return 'Logique conditionnelle'
-        elif 'MAX' in formula or 'MIN' in formula:
-            return 'Recherche d\'extrema'
-        elif 'VLOOKUP' in formula:
-            return 'Recherche de données'
-        else:
-            return 'Calcul personnalisé'
+        for keyword, calculation_type in _CALCULATION_TYPES:
+            if keyword in formula:
+                return calculation_type
+        return 'Calcul personnalisé'
     
     def _generate_recommendations(self):
         """Génère des recommandations pour l'implémentation Flutter"""
         print("💡 Génération des recommandations...")
         
-        recommendations = []
-        
+        self.analysis_result['recommendations'] = list(self._iter_recommendations())
+    
+    def _iter_recommendations(self) -> Iterator[Dict[str, str]]:
+        """Produit les recommandations au fil de l'analyse des résultats"""
         # Recommandations basées sur la complexité
         total_formulas = self.analysis_result['formulas']['total_count']
         if total_formulas > 50:
-            recommendations.append({
+            yield {
                 'type': 'performance',
                 'priority': 'high',
                 'description': 'Implémenter un système de cache pour les calculs complexes',
                 'reason': f'{total_formulas} formules détectées'
-            })
+            }
         
         # Recommandations par type de feuille
         for sheet in self.analysis_result['sheets']:
             if 'config' in sheet['name'].lower():
-                recommendations.append({
+                yield {
                     'type': 'ui',
                     'priority': 'medium',
                     'description': f'Créer des formulaires de configuration pour {sheet["name"]}',
                     'reason': 'Feuille de configuration identifiée'
-                })
+                }
             
             if sheet['analysis']['complexity'] == 'high':
-                recommendations.append({
+                yield {
                     'type': 'calculation',
                     'priority': 'high',
                     'description': f'Développer service de calcul spécialisé pour {sheet["name"]}',
                     'reason': f'Complexité élevée avec {len(sheet["formulas"])} formules'
-                })
+                }
         
         # Recommandations générales
-        recommendations.append({
+        yield {
             'type': 'architecture',
             'priority': 'high',
             'description': 'Utiliser les modèles StrategySheet existants et les adapter',
             'reason': 'Structure modulaire déjà en place'
-        })
-        
-        recommendations.append({
+        }
+        yield {
             'type': 'ui',
             'priority': 'medium',
             'description': 'Maintenir le thème racing cohérent avec l\'app',
             'reason': 'Interface déjà développée et intégrée'
-        })
-        
-        self.analysis_result['recommendations'] = recommendations
+        }
     
     def _fallback_analysis(self):
         """Analyse de base en cas d'erreur"""
@@ -393,10 +572,14 @@ class KMRSAnalyzer:
     def save_analysis(self, output_path: str = None):
         """Sauvegarde l'analyse en JSON"""
         if not output_path:
-            output_path = f"kmrs_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_path = f"kmrs_analysis_{self._analysis_time:%Y%m%d_%H%M%S}.json"
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.analysis_result, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(self.analysis_result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.analysis_result, f, indent=2, ensure_ascii=False)
         
         print(f"💾 Analyse sauvegardée: {output_path}")
         return output_path
@@ -405,6 +588,8 @@ class KMRSAnalyzer:
         """Génère les spécifications pour l'implémentation Flutter"""
         print("🎯 Génération des spécifications Flutter...")
         
+        self.analyze_sheets()
+        
         flutter_specs = {
             'models': {
                 'strategy_document': {
@@ -445,8 +630,17 @@ class KMRSAnalyzer:
         return flutter_specs
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Fonction principale d'analyse"""
+    parser = argparse.ArgumentParser(description="Analyseur automatique du fichier KMRS.xlsm")
+    parser.add_argument(
+        '-j', '--workers', type=int, default=1,
+        help="Nombre de processus pour analyser les feuilles en parallèle (défaut: 1)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers doit être supérieur ou égal à 1")
+    
     print("🚀 ANALYSEUR KMRS.xlsm")
     print("=" * 50)
     
@@ -458,7 +652,7 @@ def main():
         return
     
     # Lancer l'analyse
-    analyzer = KMRSAnalyzer(kmrs_path)
+    analyzer = KMRSAnalyzer(kmrs_path, max_workers=args.workers)
     analysis = analyzer.analyze()
     
     # Sauvegarder les résultats
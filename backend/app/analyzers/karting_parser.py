@@ -2,16 +2,33 @@
 Karting-specific WebSocket message parser inspired by drivers.py
 Uses predefined circuit mappings (C1-C14) instead of dynamic detection
 """
+import io
 import json
 import re
-from typing import Dict, Any, List, Optional, Tuple
+import sys
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterator, List, Mapping, Optional, Sequence, Tuple
 from datetime import datetime
 import structlog
 
+# HTML backend resolved once at import: lxml's C parser, BeautifulSoup as fallback
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+if etree is None:
+    try:
+        from bs4 import BeautifulSoup, SoupStrainer
+        _GRID_ROW_STRAINER = SoupStrainer('tr', attrs={'data-id': True})
+    except ImportError:
+        BeautifulSoup = None
+
 logger = structlog.get_logger(__name__)
 
 # Dictionnaire de traduction multilingue pour les colonnes
-COLUMN_TRANSLATIONS = {
+COLUMN_TRANSLATIONS = MappingProxyType({
     # Classement/Position
     "Clt": "Classement", "Pos": "Classement", "Position": "Classement", 
     "Rk": "Classement", "Rang": "Classement", "Rank": "Classement",
@@ -55,8 +72,81 @@ COLUMN_TRANSLATIONS = {
     "Name": "Pilote", "Nom": "Pilote", "Team": "Equipe", "Équipe": "Equipe",
     "Categoria": "Categorie", "In pista": "En Piste", "Pena": "Penalite", 
     "Pit stop": "Pit Stop",
+})
+
+# Recherche insensible à la casse et aux espaces ("POS", "pos " → "Classement"),
+# valeurs internées car réutilisées comme clés de chaque pilote mappé
+_COLUMN_LOOKUP = {
+    term.casefold().strip(): sys.intern(field_name)
+    for term, field_name in COLUMN_TRANSLATIONS.items()
 }
 
+# Pipe-format line: r{driver_id}c{column}|code|value (surrounding whitespace ignored)
+_PIPE_RE = re.compile(r'^[^\S\n]*r(\d+)c(\d+)\|([^|\n]*)\|([^|\n]*?)[^\S\n]*$', re.MULTILINE)
+
+# Dernière grille HTML parsée {grid_html: rows} : le serveur renvoie la même grille
+# init à chaque reconnexion, ses lignes sont alors réutilisées sans reparser le HTML
+_GRID_ROWS_CACHE: Dict[str, Tuple[Tuple[str, List[Tuple[Optional[str], str]]], ...]] = {}
+
+# (clé, numéro) de colonne précalculés pour les cellules d'une ligne : ("C1", "1"), ("C2", "2")...
+# Clés internées : une seule chaîne partagée par toutes les entrées raw_data / raw_columns
+_GRID_COLUMNS = tuple((sys.intern(f"C{index}"), sys.intern(str(index))) for index in range(1, 65))
+# Même clé retrouvée depuis le numéro de colonne d'une ligne pipe ("7" → "C7")
+_COLUMN_KEY_BY_NUMBER = {column_number: column_key for column_key, column_number in _GRID_COLUMNS}
+
+# En-têtes déjà traduits {cellules d'en-tête r0: mappings détectés}, borné à quelques circuits
+_HEADER_MAPPINGS_CACHE: Dict[Tuple[Tuple[Optional[str], str], ...], Dict[str, str]] = {}
+_HEADER_MAPPINGS_CACHE_SIZE = 32
+
+
+def _build_column_mapper(circuit_mappings: Dict[str, str]) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    """
+    Generate a column mapping function specialized for a circuit's C1-C14 mappings
+    Field names are inlined as constants, so no mapping lookup happens per message
+    """
+    lines = ['def map_columns(raw_columns, out):', '    found = 0']
+    for column_key, field_name in circuit_mappings.items():
+        lines += [
+            f'    column_data = raw_columns.get({column_key!r})',
+            '    if column_data is not None:',
+            '        found += 1',
+            f'        out[{field_name!r}] = column_data["value"]',
+        ]
+    lines += [
+        '    if found != len(raw_columns):',
+        '        # Unmapped columns keep their raw column key',
+        '        for column_key, column_data in raw_columns.items():',
+        '            if column_key not in MAPPED:',
+        '                out[column_key] = column_data["value"]',
+    ]
+    
+    namespace = {'MAPPED': frozenset(circuit_mappings)}
+    exec('\n'.join(lines), namespace)
+    return namespace['map_columns']
+
+
+# Generated mapper and column order by mappings content: a parser is built per batch,
+# both are computed once per distinct mappings
+_COLUMN_MAPPER_CACHE: Dict[
+    Tuple[Tuple[str, str], ...],
+    Tuple[Callable[[Dict[str, Any], Dict[str, Any]], None], Tuple[str, ...]]
+] = {}
+_COLUMN_MAPPER_CACHE_SIZE = 64
+
+
+def _get_column_mapper(circuit_mappings: Dict[str, str]) -> Tuple[Callable[[Dict[str, Any], Dict[str, Any]], None], Tuple[str, ...]]:
+    """Return the cached (column mapping function, column order) for these mappings, built on first use"""
+    cache_key = tuple(circuit_mappings.items())
+    cached = _COLUMN_MAPPER_CACHE.get(cache_key)
+    if cached is None:
+        if len(_COLUMN_MAPPER_CACHE) >= _COLUMN_MAPPER_CACHE_SIZE:
+            _COLUMN_MAPPER_CACHE.clear()
+        # Field names sorted by column number (C1→C2→C3...), sent to clients
+        sorted_columns = sorted(cache_key, key=lambda x: int(x[0][1:]) if x[0][1:].isdigit() else 999)
+        column_order = tuple(column_name for column_id, column_name in sorted_columns)
+        cached = _COLUMN_MAPPER_CACHE[cache_key] = (_build_column_mapper(circuit_mappings), column_order)
+    return cached
+
 
 class KartingMessageParser:
     """
@@ -80,14 +170,41 @@ class KartingMessageParser:
         self.driver_states: Dict[str, Dict[str, Any]] = {}
         
         # Raw WebSocket data storage (equivalent to drivers.py raw_data)
-        self.raw_data: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        # Flat: {(driver_id, column_key): (code, value)}
+        self.raw_data: Dict[Tuple[str, str], Tuple[str, str]] = {}
         
         # Statistics for monitoring
         self.message_count = 0
-        self.last_update = None
+        self._last_update_ts = 0.0  # time.time() of the last parsed batch
         
         logger.info(f"KartingParser initialized with {len(self.circuit_mappings)} column mappings")
     
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """Time of the last parsed message, built on demand from the stored timestamp"""
+        return datetime.fromtimestamp(self._last_update_ts) if self._last_update_ts else None
+    
+    def _last_update_iso(self) -> Optional[str]:
+        """last_update as an ISO string, None before the first parsed message"""
+        last_update = self.last_update
+        return last_update.isoformat() if last_update else None
+    
+    @property
+    def circuit_mappings(self) -> Dict[str, str]:
+        """Current C1-C14 mappings"""
+        return self._circuit_mappings
+    
+    @circuit_mappings.setter
+    def circuit_mappings(self, mappings: Dict[str, str]):
+        self._circuit_mappings = mappings
+        # Specialized mapping function and column order, computed once per distinct mappings
+        self._map_columns, self._column_order = _get_column_mapper(mappings)
+    
+    @property
+    def column_order(self) -> List[str]:
+        """Field names sorted by column number (C1→C2→C3...), sent to clients"""
+        return list(self._column_order)
+    
     def update_circuit_mappings(self, mappings: Dict[str, str]):
         """
         Update circuit mappings when switching circuits
@@ -112,40 +229,65 @@ class KartingMessageParser:
         Returns:
             Dictionary with parsed data and driver updates
         """
-        self.message_count += 1
-        self.last_update = datetime.now()
+        return self.parse_batch((message,))
+    
+    def parse_batch(self, messages: Sequence[str]) -> Dict[str, Any]:
+        """
+        Parse several WebSocket messages into one merged result
+        Driver columns are merged in message order (last write wins) and
+        circuit mappings are applied once for the whole batch
         
-        logger.info(f"Parsing karting message #{self.message_count}")
+        Args:
+            messages: Raw WebSocket messages, in arrival order
+            
+        Returns:
+            Dictionary with parsed data and driver updates (same shape as parse_message)
+        """
+        self.message_count += len(messages)
+        self._last_update_ts = time.time()
+        # One timestamp shared by every driver update of this batch
+        timestamp = datetime.fromtimestamp(self._last_update_ts).isoformat()
         
         result = {
             'success': False,
-            'drivers_updated': set(),
+            'drivers_updated': (),
             'mapped_data': {},
             'raw_updates': {},
             'message_count': self.message_count,
-            'timestamp': self.last_update.isoformat()
+            'message_format': None,
+            'timestamp': timestamp
         }
         
         try:
-            # Detect message type and parse accordingly
-            if 'init' in message:
-                # Parse composite initial message with HTML grid data
-                raw_updates = self._parse_html_grid(message)
-                logger.debug(f"Parsed composite message with HTML grid format")
-            else:
-                # Parse pipe format (real-time updates)
-                raw_updates = self._parse_pipe_format(message)
-                logger.debug(f"Parsed pipe format")
+            raw_updates = {}
+            
+            for message in messages:
+                # %-style arguments: formatting only happens if DEBUG is enabled
+                logger.debug("Parsing karting message (%d chars)", len(message))
+                message_format, message_updates = self._parse_raw_updates(message, timestamp)
+                
+                if result['message_format'] != 'html_grid':
+                    result['message_format'] = message_format
+                
+                if not raw_updates:
+                    raw_updates = message_updates
+                    continue
+                
+                for driver_id, update in message_updates.items():
+                    if driver_id in raw_updates:
+                        raw_updates[driver_id]['raw_columns'].update(update['raw_columns'])
+                    else:
+                        raw_updates[driver_id] = update
             
             if raw_updates:
                 result['success'] = True
-                result['drivers_updated'] = set(raw_updates.keys())
+                result['drivers_updated'] = tuple(raw_updates)
                 result['raw_updates'] = raw_updates
                 
                 # Apply circuit mappings to get structured data
                 result['mapped_data'] = self._apply_circuit_mappings(raw_updates)
                 
-                logger.debug(f"Successfully parsed {len(raw_updates)} driver updates")
+                logger.debug("Successfully parsed %d driver updates", len(raw_updates))
             else:
                 logger.warning("No valid karting data found in message")
                 
@@ -155,98 +297,153 @@ class KartingMessageParser:
         
         return result
     
-    def _parse_html_grid(self, message: str) -> Dict[str, Dict[str, Any]]:
+    def _parse_raw_updates(self, message: str, timestamp: str) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """Detect the message format and extract raw driver updates"""
+        if self._is_init_message(message):
+            # Parse composite initial message with HTML grid data
+            raw_updates = self._parse_html_grid(message, timestamp)
+            logger.debug("Parsed composite message with HTML grid format")
+            return 'html_grid', raw_updates
+        
+        # Parse pipe format (real-time updates)
+        raw_updates = self._parse_pipe_format(message, timestamp)
+        logger.debug("Parsed pipe format: %d drivers updated", len(raw_updates))
+        return 'pipe', raw_updates
+    
+    @staticmethod
+    def _is_init_message(message: str) -> bool:
+        """
+        Composite initial messages open with an 'init' line: probe the head of
+        the message instead of scanning the whole (possibly large) payload
+        """
+        return message.startswith('init') or '\ninit' in message[:256]
+    
+    def _parse_html_grid(self, message: str, timestamp: str) -> Dict[str, Dict[str, Any]]:
         """
         Parse HTML grid format from composite initial WebSocket message
         Format: Multiple lines with one line containing grid||<tbody><tr data-id="r{driver_id}">...
         """
         updates = {}
         
-        # Split message into lines and find the grid line
-        lines = message.strip().split('\n')
+        # Locate the grid line with find() instead of splitting the whole message into lines
+        grid_start = message.find('grid||')
+        while grid_start > 0 and message[grid_start - 1] != '\n':
+            # Marker must open a line
+            grid_start = message.find('grid||', grid_start + 1)
         
         html_content = None
         
-        for i, line in enumerate(lines):
-            if line.startswith('grid||'):
-                html_content = line[6:]  # Remove "grid||" prefix
-                break
+        if grid_start >= 0:
+            grid_end = message.find('\n', grid_start)
+            html_content = message[grid_start + 6:grid_end if grid_end >= 0 else None]  # Remove "grid||" prefix
         
         if not html_content:
             logger.warning("No grid|| line found in composite message")
             return updates
         
+        if etree is None and BeautifulSoup is None:
+            logger.error("Neither lxml nor BeautifulSoup available for HTML parsing")
+            return updates
+        
         # Parse HTML to extract driver data
+        raw_data = self.raw_data
         try:
-            # Import here to avoid dependency issues if not installed
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # AUTO-DÉTECTION DES COLONNES depuis l'en-tête HTML
-            header_row = soup.find('tr', {'data-id': 'r0'})
-            
-            if header_row:
-                auto_detection_success = self._extract_column_mappings_from_header(header_row)
-            
-            # Find all driver rows (excluding header row with data-id="r0")
-            driver_rows = soup.find_all('tr', {'data-id': lambda x: x and x.startswith('r') and x != 'r0'})
+            # Header row (data-id="r0") included; identical grids are not parsed again
+            rows = _GRID_ROWS_CACHE.get(html_content)
+            if rows is None:
+                rows = tuple(self._iter_grid_rows(html_content))
+                _GRID_ROWS_CACHE.clear()
+                _GRID_ROWS_CACHE[html_content] = rows
             
-            for row in driver_rows:
-                driver_id_attr = row.get('data-id')
-                if not driver_id_attr:
+            for driver_id_attr, cells in rows:
+                if driver_id_attr == 'r0':
+                    # AUTO-DÉTECTION DES COLONNES depuis l'en-tête HTML
+                    self._extract_column_mappings_from_header(cells)
                     continue
                 
+                if not driver_id_attr.startswith('r'):
+                    continue
+
                 # Extract driver ID (remove 'r' prefix)
                 driver_id = driver_id_attr[1:]  # Remove 'r' prefix
                 
-                # Create update entry
-                updates[driver_id] = {
-                    'driver_id': driver_id,
-                    'raw_columns': {},
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Extract all column data for this driver
-                cells = row.find_all('td')
-                column_index = 1  # Start from C1
+                # Column (key, number) for each cell, starting from C1
+                columns = _GRID_COLUMNS
+                if len(cells) > len(columns):
+                    columns += tuple((f"C{index}", str(index)) for index in range(len(columns) + 1, len(cells) + 1))
                 
-                for cell in cells:
-                    # Extract cell value (text content)
-                    cell_value = cell.get_text(strip=True)
-                    
-                    # Skip empty cells
-                    if not cell_value:
-                        column_index += 1
-                        continue
-                    
-                    column_key = f"C{column_index}"
-                    
-                    # Store in raw_columns format
-                    updates[driver_id]['raw_columns'][column_key] = {
+                # Extract all non-empty column data for this driver, built in one pass
+                raw_columns = {
+                    column_key: {
                         'code': 'HTML',  # Mark as HTML-sourced
                         'value': cell_value,
-                        'column_number': str(column_index)
+                        'column_number': column_number
                     }
-                    
-                    # Also store in raw_data for consistency with pipe format
-                    if driver_id not in self.raw_data:
-                        self.raw_data[driver_id] = {}
-                    self.raw_data[driver_id][column_key] = ('HTML', cell_value)
-                    
-                    column_index += 1
+                    for (column_key, column_number), (_, cell_value) in zip(columns, cells)
+                    if cell_value
+                }
+                
+                # Also store in raw_data for consistency with pipe format
+                raw_data.update({
+                    (driver_id, column_key): ('HTML', column_data['value'])
+                    for column_key, column_data in raw_columns.items()
+                })
                 
-                logger.debug(f"HTML Grid: Driver {driver_id} with {len(updates[driver_id]['raw_columns'])} columns")
+                # Create update entry
+                updates[driver_id] = {
+                    'driver_id': driver_id,
+                    'raw_columns': raw_columns,
+                    'timestamp': timestamp
+                }
             
-            logger.info(f"Parsed HTML grid: {len(updates)} drivers with complete data")
+            # One summary per grid instead of one log call per driver row
+            logger.info("Parsed HTML grid: %d drivers with complete data", len(updates))
             
-        except ImportError:
-            logger.error("BeautifulSoup not available for HTML parsing")
         except Exception as e:
             logger.error(f"Error parsing HTML grid: {e}")
-        
+
         return updates
-    
-    def _extract_column_mappings_from_header(self, header_row) -> bool:
+
+    @staticmethod
+    def _iter_grid_rows(html_content: str) -> Iterator[Tuple[str, List[Tuple[Optional[str], str]]]]:
+        """
+        Iterate <tr data-id="..."> rows of the HTML grid
+        Yields (row data-id, [(cell data-id, cell text), ...]) by streaming rows with
+        lxml's C parser, falling back to BeautifulSoup when lxml is not installed
+        """
+        if etree is not None:
+            rows = etree.iterparse(
+                io.BytesIO(html_content.encode('utf-8')),
+                events=('end',), tag='tr', html=True, encoding='utf-8'
+            )
+            for _, row in rows:
+                row_id = row.get('data-id')
+                if row_id:
+                    yield row_id, [
+                        (
+                            cell.get('data-id'),
+                            # Plain cells: read .text directly, walk nested markup only when present
+                            (cell.text or '').strip() if not len(cell)
+                            else ''.join(text.strip() for text in cell.itertext())
+                        )
+                        for cell in row.iter('td')
+                    ]
+                
+                # Free processed rows so memory stays bounded to one row
+                row.clear()
+                while row.getprevious() is not None:
+                    del row.getparent()[0]
+            return
+
+        # Only <tr data-id> rows (and their cells) are built into the tree
+        soup = BeautifulSoup(html_content, 'html.parser', parse_only=_GRID_ROW_STRAINER)
+        for row in soup.find_all('tr'):
+            yield row['data-id'], [
+                (cell.get('data-id'), cell.get_text(strip=True))
+                for cell in row.find_all('td')
+            ]
+
+    def _extract_column_mappings_from_header(self, header_cells: List[Tuple[Optional[str], str]]) -> bool:
         """
         Extraire les mappings de colonnes depuis la ligne d'en-tête HTML (r0)
         Supporte les circuits internationaux via traduction automatique
@@ -255,38 +452,44 @@ class KartingMessageParser:
         unknown_terms = []
         
         try:
-            # Trouver toutes les cellules d'en-tête avec data-id="c1", "c2", etc.
-            header_cells = header_row.find_all('td', {'data-id': lambda x: x and x.startswith('c')})
+            # En-tête déjà vu (reconnexion) : réutiliser la traduction sans la refaire ni la relogger
+            header_key = tuple(header_cells)
+            cached_mappings = _HEADER_MAPPINGS_CACHE.get(header_key)
+            if cached_mappings is not None:
+                if len(cached_mappings) >= 3:
+                    self.circuit_mappings = dict(cached_mappings)
+                    return True
+                return False
             
-            for i, cell in enumerate(header_cells):
-                column_id = cell.get('data-id')
-                
-                if not column_id:
+            # Parcourir les cellules d'en-tête avec data-id="c1", "c2", etc.
+            for column_id, column_text in header_cells:
+                if not column_id or not column_id.startswith('c'):
                     continue
-                
-                # Extraire le texte de la colonne
-                column_text = cell.get_text(strip=True)
+
                 column_key = column_id.upper()  # C1, C2, etc.
                 
                 # Chercher une traduction dans le dictionnaire
-                normalized_name = COLUMN_TRANSLATIONS.get(column_text)
+                normalized_name = _COLUMN_LOOKUP.get(column_text.casefold().strip())
                 
                 if normalized_name:
                     detected_mappings[column_key] = normalized_name
-                    logger.debug(f"Traduit: {column_text} → {normalized_name} ({column_key})")
+                    logger.debug("Traduit: %s → %s (%s)", column_text, normalized_name, column_key)
                 else:
                     # Terme non reconnu, garder l'original et logger
                     detected_mappings[column_key] = column_text
                     unknown_terms.append(column_text)
                     logger.warning(f"Terme inconnu: {column_text} ({column_key})")
             
+            if len(_HEADER_MAPPINGS_CACHE) >= _HEADER_MAPPINGS_CACHE_SIZE:
+                _HEADER_MAPPINGS_CACHE.clear()
+            _HEADER_MAPPINGS_CACHE[header_key] = dict(detected_mappings)
+            
             # Vérifier si l'auto-détection a réussi (au moins 3 colonnes)
             if len(detected_mappings) >= 3:
                 logger.info(f"Auto-détection réussie: {len(detected_mappings)} colonnes détectées")
                 logger.info(f"Mappings détectés: {detected_mappings}")
                 
                 # Mettre à jour les mappings utilisés par le parser
-                old_mappings = self.circuit_mappings.copy()
                 self.circuit_mappings = detected_mappings
                 
                 # Logger les termes inconnus pour enrichissement futur
@@ -300,7 +503,6 @@ class KartingMessageParser:
                 return False
                 
         except Exception as e:
-            import traceback
             logger.error(f"Erreur lors de l'extraction des mappings: {e}")
             return False
     
@@ -342,108 +544,75 @@ class KartingMessageParser:
                     logger.error(f"Échec sauvegarde mappings auto-détectés pour circuit {circuit_id}")
                     
             except Exception as firebase_error:
-                import traceback
                 logger.error(f"Erreur intégration Firebase: {firebase_error}")
             
         except Exception as e:
-            import traceback
             logger.error(f"Erreur sauvegarde Firebase mappings détectés: {e}")
 
-    def _save_null_mappings_to_firebase(self, circuit_id: str = None):
+    async def _save_null_mappings_to_firebase(self, circuit_id: str = None):
         """Sauvegarder des mappings null dans Firebase pour indiquer l'échec d'auto-détection"""
         try:
-            import asyncio
-            
             logger.warning("Firebase: Sauvegarde des mappings null pour échec d'auto-détection")
             
             if not circuit_id:
                 logger.warning("Pas d'ID de circuit fourni - sauvegarde Firebase ignorée")
                 return
             
-            # Utiliser l'intégration Firebase réelle
+            # Utiliser l'intégration Firebase réelle avec await (pas d'event loop)
             try:
                 from ..services.firebase_sync import firebase_sync
                 
-                # Créer une fonction async et l'exécuter
-                async def save_null_mappings():
-                    return await firebase_sync.save_null_mappings_to_circuit(circuit_id)
+                success = await firebase_sync.save_null_mappings_to_circuit(circuit_id)
                 
-                # Exécuter la sauvegarde Firebase de manière synchrone
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    success = loop.run_until_complete(save_null_mappings())
-                    if success:
-                        logger.info(f"Mappings null sauvegardés avec succès pour circuit {circuit_id}")
-                    else:
-                        logger.error(f"Échec sauvegarde mappings null pour circuit {circuit_id}")
-                finally:
-                    loop.close()
+                if success:
+                    logger.info(f"Mappings null sauvegardés avec succès pour circuit {circuit_id}")
+                else:
+                    logger.error(f"Échec sauvegarde mappings null pour circuit {circuit_id}")
                     
             except Exception as firebase_error:
-                import traceback
                 logger.error(f"Erreur intégration Firebase: {firebase_error}")
                 logger.warning("Configuration manuelle nécessaire pour ce circuit")
             
         except Exception as e:
-            import traceback
             logger.error(f"Erreur sauvegarde Firebase: {e}")
     
-    def _parse_pipe_format(self, message: str) -> Dict[str, Dict[str, Any]]:
+    def _parse_pipe_format(self, message: str, timestamp: str) -> Dict[str, Dict[str, Any]]:
         """
         Parse pipe-delimited format exactly like drivers.py
         Handles: ident|code|value where ident = r{driver_id}c{column}
         """
         updates = {}
-        lines = message.strip().split('\n')
+        raw_data = self.raw_data
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Split by pipe (exactly like drivers.py)
-            parts = line.split('|')
-            if len(parts) != 3:
-                continue
-            
-            ident, code, value = parts
+        # One regex sweep over the whole message instead of splitting it into lines
+        if '\n' in message:
+            matches = _PIPE_RE.finditer(message)
+        else:
+            # Fast path for the common single-line update: one anchored match, no iterator
+            match = _PIPE_RE.match(message)
+            matches = (match,) if match else ()
+        
+        for match in matches:
+            driver_id, col, code, value = match.groups()
             
-            # Validate format: must start with 'r' and contain 'c'
-            if not ident.startswith('r') or 'c' not in ident:
-                continue
+            # Store in raw_data structure (like drivers.py)
+            column_key = _COLUMN_KEY_BY_NUMBER.get(col) or f"C{col}"
+            raw_data[(driver_id, column_key)] = (code, value)
             
-            try:
-                # Extract driver ID and column (exactly like drivers.py)
-                pilot_raw, col = ident.split('c')
-                driver_id = pilot_raw[1:]  # Remove 'r' prefix
-                
-                # Store in raw_data structure (like drivers.py)
-                if driver_id not in self.raw_data:
-                    self.raw_data[driver_id] = {}
-                
-                column_key = f"C{col}"
-                self.raw_data[driver_id][column_key] = (code, value)
-                
-                # Create update entry
-                if driver_id not in updates:
-                    updates[driver_id] = {
-                        'driver_id': driver_id,
-                        'raw_columns': {},
-                        'timestamp': datetime.now().isoformat()
-                    }
-                
-                updates[driver_id]['raw_columns'][column_key] = {
-                    'code': code,
-                    'value': value,
-                    'column_number': col
+            # Create update entry (single lookup per line)
+            update = updates.get(driver_id)
+            if update is None:
+                update = updates[driver_id] = {
+                    'driver_id': driver_id,
+                    'raw_columns': {},
+                    'timestamp': timestamp
                 }
-                
-                logger.debug(f"Karting data: Driver {driver_id} -> C{col} = {value} (code: {code})")
-                
-            except ValueError as e:
-                logger.warning(f"Malformed ident '{ident}': {e}")
-                continue
+            
+            update['raw_columns'][column_key] = {
+                'code': code,
+                'value': value,
+                'column_number': col
+            }
         
         return updates
     
@@ -453,22 +622,19 @@ class KartingMessageParser:
         Equivalent to drivers.py remap_drivers() function
         """
         mapped_data = {}
+        map_columns = self._map_columns
         
         for driver_id, update_data in raw_updates.items():
+            raw_columns = update_data.get('raw_columns', {})
             mapped_driver = {
                 'driver_id': driver_id,
-                'timestamp': update_data['timestamp']
+                'timestamp': update_data['timestamp'],
+                # Keep raw data for debugging (shared reference, not a copy per column)
+                '_raw': raw_columns
             }
             
             # Apply mappings for each column
-            raw_columns = update_data.get('raw_columns', {})
-            for column_key, column_data in raw_columns.items():
-                # Get human-readable field name from mapping
-                field_name = self.circuit_mappings.get(column_key, column_key)
-                mapped_driver[field_name] = column_data['value']
-                
-                # Keep raw data for debugging
-                mapped_driver[f"{column_key}_raw"] = column_data
+            map_columns(raw_columns, mapped_driver)
             
             mapped_data[driver_id] = mapped_driver
         
@@ -483,17 +649,16 @@ class KartingMessageParser:
         
         # Create new driver states using current mappings
         new_driver_states = {}
+        # Raw (code, value) pairs stay in raw_data, only mapped values are copied
+        field_for = self._circuit_mappings.get
         
-        for driver_id, raw_columns in self.raw_data.items():
-            mapped_driver = {'driver_id': driver_id}
+        for (driver_id, column_key), (_, value) in self.raw_data.items():
+            mapped_driver = new_driver_states.get(driver_id)
+            if mapped_driver is None:
+                mapped_driver = new_driver_states[driver_id] = {'driver_id': driver_id}
             
             # Apply current circuit mappings
-            for column_key, (code, value) in raw_columns.items():
-                field_name = self.circuit_mappings.get(column_key, column_key)
-                mapped_driver[field_name] = value
-                mapped_driver[f"{column_key}_raw"] = {'code': code, 'value': value}
-            
-            new_driver_states[driver_id] = mapped_driver
+            mapped_driver[field_for(column_key, column_key)] = value
         
         self.driver_states = new_driver_states
         logger.info(f"Remapped {len(new_driver_states)} drivers")
@@ -502,13 +667,13 @@ class KartingMessageParser:
         """Get current mapped state for a specific driver"""
         return self.driver_states.get(driver_id)
     
-    def get_all_driver_states(self) -> Dict[str, Dict[str, Any]]:
-        """Get all current mapped driver states"""
-        return self.driver_states.copy()
+    def get_all_driver_states(self) -> Mapping[str, Dict[str, Any]]:
+        """Get all current mapped driver states (read-only view, copy with dict() to mutate)"""
+        return MappingProxyType(self.driver_states)
     
-    def get_raw_data(self) -> Dict[str, Dict[str, Tuple[str, str]]]:
-        """Get raw WebSocket data (equivalent to drivers.py raw_data)"""
-        return self.raw_data.copy()
+    def get_raw_data(self) -> Mapping[Tuple[str, str], Tuple[str, str]]:
+        """Get raw WebSocket data (equivalent to drivers.py raw_data, read-only view)"""
+        return MappingProxyType(self.raw_data)
     
     def clear_all_data(self):
         """Clear all data (useful for new sessions)"""
@@ -524,10 +689,11 @@ class KartingMessageParser:
         """
         return {
             'driver_states': self.driver_states,
-            'raw_data': self.raw_data,
+            # Nested per driver so the export stays JSON-serializable
+            'raw_data': self._nested_raw_data(),
             'circuit_mappings': self.circuit_mappings,
             'message_count': self.message_count,
-            'last_update': self.last_update.isoformat() if self.last_update else None,
+            'last_update': self._last_update_iso(),
             'export_timestamp': datetime.now().isoformat()
         }
     
@@ -538,14 +704,14 @@ class KartingMessageParser:
         if 'driver_states' in data:
             self.driver_states = data['driver_states']
         if 'raw_data' in data:
-            # Convert back to tuple format
-            self.raw_data = {
-                driver_id: {
-                    col: tuple(val) if isinstance(val, list) else val 
-                    for col, val in columns.items()
-                }
-                for driver_id, columns in data['raw_data'].items()
-            }
+            raw_data = self.raw_data = {}
+            # Exported format: {driver_id: {column_key: (code, value)}}, one comprehension per driver
+            for driver_id, columns in data['raw_data'].items():
+                # Convert back to tuple format (pairs come back as lists from JSON)
+                raw_data.update({
+                    (driver_id, column_key): tuple(val) if isinstance(val, list) else val
+                    for column_key, val in columns.items()
+                })
         if 'circuit_mappings' in data:
             self.circuit_mappings = data['circuit_mappings']
         if 'message_count' in data:
@@ -558,7 +724,14 @@ class KartingMessageParser:
         return {
             'total_drivers': len(self.driver_states),
             'total_messages': self.message_count,
-            'last_update': self.last_update.isoformat() if self.last_update else None,
+            'last_update': self._last_update_iso(),
             'circuit_mappings_count': len(self.circuit_mappings),
-            'raw_data_entries': sum(len(cols) for cols in self.raw_data.values())
+            'raw_data_entries': len(self.raw_data)
         }
+    
+    def _nested_raw_data(self) -> Dict[str, Dict[str, Tuple[str, str]]]:
+        """Regroup the flat raw_data per driver: {driver_id: {column_key: (code, value)}}"""
+        nested = {}
+        for (driver_id, column_key), code_value in self.raw_data.items():
+            nested.setdefault(driver_id, {})[column_key] = code_value
+        return nested
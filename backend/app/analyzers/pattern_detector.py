@@ -3,7 +3,7 @@ Pattern detection for timing data
 """
 import re
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 import structlog
 
@@ -13,31 +13,64 @@ logger = structlog.get_logger(__name__)
 class PatternDetector:
     """Detect patterns in timing data messages"""
     
-    # Regex patterns for different data types
-    TIME_PATTERNS = [
-        r'\d{1,2}:\d{2}\.\d{3}',  # 1:23.456
-        r'\d{1,2}:\d{2}:\d{2}\.\d{3}',  # 1:23:45.678
-        r'\d+\.\d{3}',  # 123.456 (seconds only)
-        r'\d{2}:\d{2}\.\d{2}',  # 01:23.45
-    ]
-    
-    POSITION_PATTERNS = [
-        r'P\d+',  # P1, P2, etc.
-        r'#\d+',  # #1, #2, etc.
-        r'(?:^|\s)(\d+)(?:\s|$)',  # standalone numbers
-        r'Pos\s*:?\s*(\d+)',  # Pos: 1, Pos 1
-    ]
-    
-    KART_NUMBER_PATTERNS = [
-        r'(?:Kart|Car|#)\s*(\d+)',
-        r'(?:^|\s)(\d{1,3})(?:\s|$)',  # 1-3 digit numbers
-    ]
-    
-    DRIVER_PATTERNS = [
-        r'[A-Z][a-z]+\s+[A-Z][a-z]+',  # First Last
-        r'[A-Z]{3,}',  # ALL CAPS names
-        r'[A-Z]\.\s*[A-Z][a-z]+',  # J. Smith
-    ]
+    # Regex patterns for different data types (compiled once, matched case-insensitively)
+    TIME_PATTERNS = (
+        re.compile(r'\d{1,2}:\d{2}\.\d{3}', re.IGNORECASE),  # 1:23.456
+        re.compile(r'\d{1,2}:\d{2}:\d{2}\.\d{3}', re.IGNORECASE),  # 1:23:45.678
+        re.compile(r'\d+\.\d{3}', re.IGNORECASE),  # 123.456 (seconds only)
+        re.compile(r'\d{2}:\d{2}\.\d{2}', re.IGNORECASE),  # 01:23.45
+    )
+    
+    POSITION_PATTERNS = (
+        re.compile(r'P\d+', re.IGNORECASE),  # P1, P2, etc.
+        re.compile(r'#\d+', re.IGNORECASE),  # #1, #2, etc.
+        re.compile(r'(?:^|\s)(\d+)(?:\s|$)', re.IGNORECASE),  # standalone numbers
+        re.compile(r'Pos\s*:?\s*(\d+)', re.IGNORECASE),  # Pos: 1, Pos 1
+    )
+    
+    KART_NUMBER_PATTERNS = (
+        re.compile(r'(?:Kart|Car|#)\s*(\d+)', re.IGNORECASE),
+        re.compile(r'(?:^|\s)(\d{1,3})(?:\s|$)', re.IGNORECASE),  # 1-3 digit numbers
+    )
+    
+    DRIVER_PATTERNS = (
+        re.compile(r'[A-Z][a-z]+\s+[A-Z][a-z]+', re.IGNORECASE),  # First Last
+        re.compile(r'[A-Z]{3,}', re.IGNORECASE),  # ALL CAPS names
+        re.compile(r'[A-Z]\.\s*[A-Z][a-z]+', re.IGNORECASE),  # J. Smith
+    )
+    
+    # Categories whose every pattern needs a digit, ruled out together by one digit check
+    DIGIT_CATEGORIES = frozenset({'time', 'position', 'kart_number'})
+    DIGIT_PATTERN = re.compile(r'\d')
+    
+    # Common mappings: column hint category -> hints looked for in names
+    MAPPING_HINTS = {
+        'classement': ('position', 'pos', 'rank'),
+        'kart': ('kart', 'car', 'num', 'number'),
+        'equipe/pilote': ('driver', 'pilot', 'team', 'name'),
+        'dernier t.': ('time', 'lap', 'last'),
+        's1': ('s1', 'sector1'),
+        's2': ('s2', 'sector2'),
+        's3': ('s3', 'sector3'),
+        'ecart': ('gap', 'diff', 'behind'),
+        'meilleur t.': ('best', 'fastest'),
+        'lap': ('lap', 'laps'),
+    }
+    
+    # Detected field type -> hint category a column needs to match it
+    TYPE_HINT_CATEGORIES = {
+        'position': 'classement',
+        'kart_number': 'kart',
+        'driver_name': 'equipe/pilote',
+        'lap_time': 'dernier t.',
+    }
+    
+    # Nested objects deeper than this are not sampled
+    MAX_DEPTH = 8
+    
+    # Analysis cache bounds: sampled values repeat a lot, long blobs rarely do
+    ANALYSIS_CACHE_SIZE = 8192
+    MAX_CACHED_MESSAGE_LENGTH = 256
     
     def __init__(self):
         self.patterns = {
@@ -46,20 +79,53 @@ class PatternDetector:
             'kart_number': self.KART_NUMBER_PATTERNS,
             'driver': self.DRIVER_PATTERNS
         }
+        # One alternation per category: a single scan rules out categories with no match at all
+        self.category_filters = {
+            pattern_type: re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in patterns), re.IGNORECASE)
+            for pattern_type, patterns in self.patterns.items()
+        }
+        # message -> frozen analysis result, see analyze_message
+        self._analysis_cache: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {}
     
     def analyze_message(self, message: str) -> Dict[str, List[str]]:
-        """Analyze a single message for patterns"""
+        """Analyze a single message for patterns (memoized for short, repeated values)"""
+        if len(message) > self.MAX_CACHED_MESSAGE_LENGTH:
+            return self._analyze_message(message)
+        
+        cached = self._analysis_cache.get(message)
+        if cached is None:
+            if len(self._analysis_cache) >= self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.clear()
+            cached = self._analysis_cache[message] = tuple(
+                (pattern_type, tuple(matches))
+                for pattern_type, matches in self._analyze_message(message).items()
+            )
+        
+        # Fresh lists on every call, so callers can't alter the cached result
+        return {pattern_type: list(matches) for pattern_type, matches in cached}
+    
+    def _analyze_message(self, message: str) -> Dict[str, List[str]]:
+        """Run every pattern category over a message"""
         results = {}
+        if not message:
+            return results
+        
+        has_digit = self.DIGIT_PATTERN.search(message) is not None
         
         for pattern_type, patterns in self.patterns.items():
+            if not has_digit and pattern_type in self.DIGIT_CATEGORIES:
+                continue
+            if not self.category_filters[pattern_type].search(message):
+                continue
+            
             matches = []
             for pattern in patterns:
-                found = re.findall(pattern, message, re.IGNORECASE)
+                found = pattern.findall(message)
                 if found:
                     matches.extend(found if isinstance(found[0], str) else [m[0] if isinstance(m, tuple) else str(m) for m in found])
             
             if matches:
-                results[pattern_type] = list(set(matches))  # Remove duplicates
+                results[pattern_type] = list(dict.fromkeys(matches))  # Remove duplicates, keep match order
         
         return results
     
@@ -110,7 +176,7 @@ class PatternDetector:
         
         for sample in samples:
             if isinstance(sample, dict):
-                self._analyze_fields_recursive(sample, field_analysis)
+                self._analyze_fields(sample, field_analysis)
         
         # Score fields based on pattern frequency
         scored_fields = {}
@@ -138,21 +204,35 @@ class PatternDetector:
         
         return scored_fields
     
-    def _analyze_fields_recursive(self, data: Dict[str, Any], field_analysis: Dict[str, Dict], path: str = ""):
-        """Recursively analyze fields in nested structures"""
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if isinstance(value, dict):
-                self._analyze_fields_recursive(value, field_analysis, current_path)
-            elif isinstance(value, list):
-                for i, item in enumerate(value[:3]):  # Analyze first 3 items
-                    if isinstance(item, dict):
-                        self._analyze_fields_recursive(item, field_analysis, f"{current_path}[{i}]")
-                    else:
-                        self._add_field_sample(field_analysis, f"{current_path}[{i}]", str(item))
+    def _analyze_fields(self, data: Dict[str, Any], field_analysis: Dict[str, Dict], path: str = ""):
+        """Analyze fields in nested structures (iterative walk, objects nested up to MAX_DEPTH)"""
+        # Stack of (pending (path, value, in_list) fields, depth); iterators keep document order
+        stack = [(self._iter_object_fields(data, path), 0)]
+        
+        while stack:
+            fields, depth = stack[-1]
+            for field_path, value, in_list in fields:
+                if isinstance(value, dict):
+                    if depth < self.MAX_DEPTH:
+                        stack.append((self._iter_object_fields(value, field_path), depth + 1))
+                        break
+                elif isinstance(value, list) and not in_list:
+                    stack.append((self._iter_list_items(value, field_path), depth))
+                    break
+                else:
+                    self._add_field_sample(field_analysis, field_path, str(value))
             else:
-                self._add_field_sample(field_analysis, current_path, str(value))
+                stack.pop()
+    
+    @staticmethod
+    def _iter_object_fields(data: Dict[str, Any], path: str) -> Iterator[Tuple[str, Any, bool]]:
+        """Iterate (path, value, in_list) for the fields of an object"""
+        return ((f"{path}.{key}" if path else key, value, False) for key, value in data.items())
+    
+    @staticmethod
+    def _iter_list_items(items: List[Any], path: str) -> Iterator[Tuple[str, Any, bool]]:
+        """Iterate (path, value, in_list) for the first 3 items of a list"""
+        return ((f"{path}[{i}]", item, True) for i, item in enumerate(items[:3]))
     
     def _add_field_sample(self, field_analysis: Dict, field_path: str, value: str):
         """Add a sample value to field analysis"""
@@ -188,47 +268,29 @@ class PatternDetector:
         """Generate suggestions for mapping timing fields to C1-C14 columns"""
         suggestions = {}
         
-        # Common mappings
-        mapping_hints = {
-            'classement': ['position', 'pos', 'rank'],
-            'kart': ['kart', 'car', 'num', 'number'],
-            'equipe/pilote': ['driver', 'pilot', 'team', 'name'],
-            'dernier t.': ['time', 'lap', 'last'],
-            's1': ['s1', 'sector1'],
-            's2': ['s2', 'sector2'],
-            's3': ['s3', 'sector3'],
-            'ecart': ['gap', 'diff', 'behind'],
-            'meilleur t.': ['best', 'fastest'],
-            'lap': ['lap', 'laps'],
+        # Hint categories of each field path, matched once instead of once per column
+        field_categories = {
+            field_path: self._hint_categories(field_path.lower())
+            for field_path in timing_fields
         }
         
         for c_column, c_value in c_mappings.items():
             if not c_value or c_value.lower() == 'non utilisé':
                 continue
             
-            c_value_lower = c_value.lower()
+            column_categories = self._hint_categories(c_value.lower())
             best_match = None
             best_score = 0
             
             for field_path, field_data in timing_fields.items():
                 score = 0
-                field_path_lower = field_path.lower()
                 
                 # Check if field type matches expected type
-                if field_data['likely_type'] == 'position' and any(hint in c_value_lower for hint in mapping_hints.get('classement', [])):
-                    score += 10
-                elif field_data['likely_type'] == 'kart_number' and any(hint in c_value_lower for hint in mapping_hints.get('kart', [])):
-                    score += 10
-                elif field_data['likely_type'] == 'driver_name' and any(hint in c_value_lower for hint in mapping_hints.get('equipe/pilote', [])):
-                    score += 10
-                elif field_data['likely_type'] == 'lap_time' and any(hint in c_value_lower for hint in mapping_hints.get('dernier t.', [])):
+                if self.TYPE_HINT_CATEGORIES.get(field_data['likely_type']) in column_categories:
                     score += 10
                 
                 # Check field name similarity
-                for hint_category, hints in mapping_hints.items():
-                    if any(hint in c_value_lower for hint in hints):
-                        if any(hint in field_path_lower for hint in hints):
-                            score += 5
+                score += 5 * len(column_categories & field_categories[field_path])
                 
                 if score > best_score:
                     best_score = score
@@ -237,4 +299,11 @@ class PatternDetector:
             if best_match and best_score > 0:
                 suggestions[c_column] = best_match
         
-        return suggestions
\ No newline at end of file
+        return suggestions
+    
+    def _hint_categories(self, text: str) -> frozenset:
+        """Mapping hint categories with at least one hint contained in a lowercased text"""
+        return frozenset(
+            hint_category for hint_category, hints in self.MAPPING_HINTS.items()
+            if any(hint in text for hint in hints)
+        )
\ No newline at end of file
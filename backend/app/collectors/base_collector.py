@@ -2,7 +2,9 @@
 Base collector class for timing data
 """
 import asyncio
+import hashlib
 import time
+import types
 import websockets
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable, List
@@ -13,6 +15,9 @@ from ..core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Compiled generated parsers, keyed by a digest of their source (shared across reconnects and circuits)
+_PARSER_CODE_CACHE: Dict[bytes, types.CodeType] = {}
+
 
 class BaseCollector(ABC):
     """Base class for timing data collectors"""
@@ -55,9 +60,14 @@ class BaseCollector(ABC):
     def _create_parser(self, parser_code: str):
         """Create parser from generated code"""
         try:
-            # Execute the parser code in a safe namespace
+            # Compile the source once, then execute the cached code object in a fresh namespace
+            code_key = hashlib.blake2b(parser_code.encode('utf-8'), digest_size=16).digest()
+            code = _PARSER_CODE_CACHE.get(code_key)
+            if code is None:
+                code = _PARSER_CODE_CACHE[code_key] = compile(parser_code, f"<parser:{self.circuit_id}>", 'exec')
+            
             namespace = {}
-            exec(parser_code, namespace)
+            exec(code, namespace)
             
             # Get the GeneratedParser class
             parser_class = namespace.get('GeneratedParser')
@@ -111,13 +121,31 @@ class BaseCollector(ABC):
             # Start heartbeat task
             heartbeat_task = asyncio.create_task(self._heartbeat(websocket))
             
+            # Process messages in a separate task so parsing never delays the next recv
+            # (a full queue blocks recv, which applies backpressure on the socket)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_MESSAGE_QUEUE_SIZE)
+            consumer_task = asyncio.create_task(self._consume_messages(queue))
+            
             try:
                 while self.is_running:
                     message = await websocket.recv()
-                    await self._process_message(message)
+                    await queue.put(message)
                     
             finally:
+                # The recv loop has stopped: let the consumer finish the frames already queued
                 heartbeat_task.cancel()
+                drain_task = asyncio.ensure_future(queue.join())
+                await asyncio.wait({drain_task}, timeout=settings.WS_QUEUE_DRAIN_TIMEOUT)
+                if not drain_task.done():
+                    drain_task.cancel()
+                    logger.warning(f"Dropped {queue.qsize()} queued messages for {self.circuit_id} on disconnect")
+                
+                consumer_task.cancel()
+                try:
+                    await consumer_task
+                except asyncio.CancelledError:
+                    pass
+                
                 self.is_connected = False
                 await self._handle_connection_change(False)
     
@@ -131,17 +159,39 @@ class BaseCollector(ABC):
         except Exception as e:
             logger.debug(f"Heartbeat error: {e}")
     
-    async def _process_message(self, message: str):
-        """Process a received message - send directly to karting parser"""
+    async def _consume_messages(self, queue: asyncio.Queue):
+        """Process messages received by the recv loop, in arrival order, coalescing bursts"""
+        while True:
+            messages = [await queue.get()]
+            
+            # Let a burst of frames arrive, then take them as one batch
+            if settings.WS_BATCH_WINDOW > 0:
+                await asyncio.sleep(settings.WS_BATCH_WINDOW)
+            
+            batch_size = len(messages[0])
+            while batch_size < settings.WS_BATCH_MAX_BYTES and not queue.empty():
+                message = queue.get_nowait()
+                messages.append(message)
+                batch_size += len(message)
+            
+            try:
+                await self._process_messages(messages)
+            finally:
+                # Mark the batch processed so the disconnect drain (queue.join) can complete
+                for _ in messages:
+                    queue.task_done()
+    
+    async def _process_messages(self, messages: List[str]):
+        """Process a batch of received messages - send directly to karting parser"""
         
         try:
-            self.message_count += 1
+            self.message_count += len(messages)
             self.last_message_time = time.time()
             
             
-            # Send raw message DIRECTLY to karting parser via websocket manager
+            # Send raw messages DIRECTLY to karting parser via websocket manager
             from ..services.websocket_manager import connection_manager
-            await connection_manager.broadcast_karting_data(self.circuit_id, message)
+            await connection_manager.broadcast_karting_batch(self.circuit_id, messages)
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
@@ -27,6 +27,10 @@ class Settings(BaseSettings):
     WS_HEARTBEAT_INTERVAL: int = 30
     WS_RECONNECT_DELAY: int = 5
     WS_MAX_RECONNECT_ATTEMPTS: int = 10
+    WS_MESSAGE_QUEUE_SIZE: int = 100  # frames buffered between recv and parsing
+    WS_BATCH_WINDOW: float = 0.002  # seconds to coalesce frames before parsing
+    WS_BATCH_MAX_BYTES: int = 65536  # max payload parsed as one batch
+    WS_QUEUE_DRAIN_TIMEOUT: float = 5.0  # seconds to finish queued frames on disconnect
     
     # Analysis settings
     ANALYSIS_DURATION: int = 60  # seconds
@@ -2,6 +2,7 @@
 FastAPI main application for karting timing backend
 """
 import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,6 +10,11 @@ from fastapi.responses import JSONResponse
 from typing import Dict, Any, List, Optional
 import structlog
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from .core.config import settings
 from .core.database import init_database, firebase_manager
 from .services.firebase_sync import firebase_sync
@@ -16,8 +22,27 @@ from .services.websocket_manager import connection_manager
 from .services.database_service import db_service
 from .collectors.base_collector import collector_manager
 
+# Levels accepted by structlog's filtering logger
+_LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+}
+_log_level = _LOG_LEVELS.get(settings.LOG_LEVEL.upper())
+
+# Honour LOG_LEVEL: filtered-out calls return before any message formatting
+# (an unknown value falls back to INFO instead of preventing startup)
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(_log_level or logging.INFO)
+)
+
 logger = structlog.get_logger(__name__)
 
+if _log_level is None:
+    logger.warning(f"Unknown LOG_LEVEL {settings.LOG_LEVEL!r}, falling back to INFO")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -250,7 +275,7 @@ async def get_driver_states(circuit_id: str) -> Dict[str, Any]:
                     raise HTTPException(status_code=500, detail="Failed to initialize circuit")
             
             # Get all driver states
-            driver_states = driver_state_manager.get_all_driver_states()
+            driver_states = dict(driver_state_manager.get_all_driver_states())
             statistics = driver_state_manager.get_statistics()
             
             return {
@@ -435,8 +460,7 @@ async def websocket_endpoint(websocket: WebSocket, circuit_id: str):
                     
                     # Handle client commands
                     try:
-                        import json
-                        data = json.loads(message) if message.startswith('{') else {"type": "ping"}
+                        data = json_loads(message) if message.startswith('{') else {"type": "ping"}
                         
                         if data.get("type") == "ping":
                             logger.debug(f"Responding to ping for circuit {circuit_id}")
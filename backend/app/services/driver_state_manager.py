@@ -4,7 +4,8 @@ Inspired by drivers.py hybrid data management approach
 """
 import json
 import asyncio
-from typing import Dict, Any, Optional, Set, List
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional, Set, List
 from datetime import datetime
 from collections import OrderedDict
 import structlog
@@ -174,7 +175,7 @@ class DriverStateManager:
         except Exception as e:
             logger.error(f"Error loading static data: {e}")
     
-    async def _merge_websocket_updates(self, driver_ids: Set[str], mapped_data: Dict[str, Dict[str, Any]]) -> Set[str]:
+    async def _merge_websocket_updates(self, driver_ids: Iterable[str], mapped_data: Dict[str, Dict[str, Any]]) -> Set[str]:
         """
         Merge WebSocket updates with static data
         Equivalent to drivers.py remap_drivers() logic
@@ -219,9 +220,9 @@ class DriverStateManager:
         """Get complete merged state for a driver"""
         return self.merged_states.get(driver_id)
     
-    def get_all_driver_states(self) -> Dict[str, Dict[str, Any]]:
-        """Get all merged driver states"""
-        return self.merged_states.copy()
+    def get_all_driver_states(self) -> Mapping[str, Dict[str, Any]]:
+        """Get all merged driver states (read-only view, copy with dict() to mutate)"""
+        return MappingProxyType(self.merged_states)
     
     def get_active_drivers(self) -> List[str]:
         """Get list of drivers with recent WebSocket data"""
@@ -229,7 +230,7 @@ class DriverStateManager:
             return []
         
         # Return drivers that have WebSocket data
-        return list(self.karting_parser.get_all_driver_states().keys())
+        return list(self.karting_parser.get_all_driver_states())
     
     async def clear_session_data(self):
         """Clear all session data"""
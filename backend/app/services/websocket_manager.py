@@ -5,7 +5,7 @@ import asyncio
 import json
 import traceback
 import uuid
-from typing import Dict, Set, Any, Optional
+from typing import Dict, Set, Any, List, Optional
 from fastapi import WebSocket
 import structlog
 
@@ -111,8 +111,13 @@ class ConnectionManager:
         SIMPLIFIED: Process raw message directly through karting parser and broadcast
         Direct WebSocket → KartingParser → Clients flow
         """
-        
-        
+        await self.broadcast_karting_batch(circuit_id, [raw_message])
+    
+    async def broadcast_karting_batch(self, circuit_id: str, raw_messages: List[str]):
+        """
+        Process a batch of raw messages (coalesced by the collector) with a single
+        parser pass and broadcast the merged driver updates once
+        """
         try:
             # Import karting parser directly
             from ..analyzers.karting_parser import KartingMessageParser
@@ -128,20 +133,18 @@ class ConnectionManager:
             
             parser = KartingMessageParser(mappings)
             
-            # Parse the raw message directly
-            result = parser.parse_message(raw_message)
+            # Parse the raw messages directly, merged into one result
+            result = parser.parse_batch(raw_messages)
+            # Reuse the parser's format detection instead of rescanning the message
+            is_grid_message = result.get('message_format') == 'html_grid'
             
             if not result.get('success'):
                 logger.warning(f"Parser failed: {result.get('error', 'Unknown error')}")
                 
                 # Si l'auto-détection a échoué, sauvegarder des mappings null dans Firebase
-                if 'grid||' in raw_message:
+                if is_grid_message:
                     try:
-                        from ..services.firebase_sync import firebase_sync
-                        from ..analyzers.karting_parser import KartingMessageParser
-                        
-                        temp_parser = KartingMessageParser()
-                        temp_parser._save_null_mappings_to_firebase(circuit_id)
+                        await parser._save_null_mappings_to_firebase(circuit_id)
                         
                         logger.warning(f"Circuit {circuit_id} marked for manual configuration")
                         
@@ -153,7 +156,7 @@ class ConnectionManager:
             logger.info(f"Parser success: {len(result.get('drivers_updated', []))} drivers updated")
             
             # Si c'est un message grid|| ou init, vérifier si l'auto-détection a fonctionné
-            if 'grid||' in raw_message or 'init' in raw_message:
+            if is_grid_message:
                 if parser.circuit_mappings and len(parser.circuit_mappings) >= 3:
                     try:
                         await parser._save_detected_mappings_to_firebase(circuit_id)
@@ -173,12 +176,8 @@ class ConnectionManager:
                         simple_driver[key] = value
                 simple_drivers[driver_id] = simple_driver
             
-            # Extract column order from parser mappings (C1→C2→C3→C4...)
-            column_order = []
-            if parser.circuit_mappings:
-                # Sort by column ID (C1, C2, C3...) to get the proper order
-                sorted_columns = sorted(parser.circuit_mappings.items(), key=lambda x: int(x[0][1:]) if x[0][1:].isdigit() else 999)
-                column_order = [column_name for column_id, column_name in sorted_columns]
+            # Column order (C1→C2→C3→C4...) is computed once per mappings change by the parser
+            column_order = parser.column_order
             
             # Broadcast simple format with column order
             message = {
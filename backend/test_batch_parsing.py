@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Batch parsing and session persistence test for the karting parser
+Only needs app.analyzers.karting_parser (no HTTP, Firebase or database services)
+"""
+import json
+from app.analyzers.karting_parser import KartingMessageParser
+
+
+CIRCUIT_MAPPINGS = {
+    "C1": "Classement",
+    "C2": "Kart",
+    "C3": "Equipe/Pilote",
+    "C4": "Dernier T."
+}
+
+INIT_MESSAGE = (
+    'init|r|\n'
+    'grid||<tbody>'
+    '<tr data-id="r1"><td data-id="r1c1">1</td><td data-id="r1c2">25</td>'
+    '<td data-id="r1c3">Racing Team A</td><td data-id="r1c4">1:23.456</td></tr>'
+    '<tr data-id="r2"><td data-id="r2c1">2</td><td data-id="r2c2">42</td>'
+    '<td data-id="r2c3">Speed Devils</td><td data-id="r2c4"></td></tr>'
+    '</tbody>'
+)
+
+
+def merge_sequential(results):
+    """Merge successive parse_message results per driver (last write wins per field)"""
+    merged = {}
+    for result in results:
+        for driver_id, mapped in result['mapped_data'].items():
+            state = merged.setdefault(driver_id, {'_raw': {}})
+            state['_raw'].update(mapped['_raw'])
+            state.update({field: value for field, value in mapped.items() if field not in ('_raw', 'timestamp')})
+    return merged
+
+
+def without_timestamps(mapped_data):
+    """Drop per-call timestamps so batch and sequential results can be compared"""
+    return {
+        driver_id: {field: value for field, value in mapped.items() if field != 'timestamp'}
+        for driver_id, mapped in mapped_data.items()
+    }
+
+
+def test_batch_parsing():
+    """Test that parse_batch matches sequential parse_message calls"""
+    print("📦 Testing batch parsing...")
+    
+    scenarios = {
+        # Same driver/column written twice: the later message wins
+        'last write wins': [
+            "r1c4|tn|1:23.456\nr2c4|tn|1:24.123",
+            "r1c4|tb|1:22.987\nr1c1|in|2",
+            "r2c1|in|1",
+        ],
+        # Init grid followed by pipe updates overriding some of its cells
+        'init grid + pipe updates': [
+            INIT_MESSAGE,
+            "r2c4|tn|1:24.500\nr1c3||Racing Team A2",
+            "r3c1|in|3",
+        ],
+        'empty batch': [],
+    }
+    
+    all_ok = True
+    for name, messages in scenarios.items():
+        batch_parser = KartingMessageParser(dict(CIRCUIT_MAPPINGS))
+        sequential_parser = KartingMessageParser(dict(CIRCUIT_MAPPINGS))
+        
+        batch_result = batch_parser.parse_batch(messages)
+        sequential_results = [sequential_parser.parse_message(message) for message in messages]
+        
+        # Drivers in first-seen order across the sequential results
+        sequential_drivers = list(dict.fromkeys(
+            driver_id for result in sequential_results for driver_id in result['drivers_updated']
+        ))
+        
+        checks = {
+            'raw_data': batch_parser.raw_data == sequential_parser.raw_data,
+            'drivers_updated': list(batch_result['drivers_updated']) == sequential_drivers,
+            'mapped_data': without_timestamps(batch_result['mapped_data']) == merge_sequential(sequential_results),
+            'success': batch_result['success'] == any(result['success'] for result in sequential_results),
+            'message_count': batch_parser.message_count == sequential_parser.message_count,
+        }
+        failed = [check for check, ok in checks.items() if not ok]
+        
+        if failed:
+            all_ok = False
+            print(f"❌ {name}: batch differs from sequential parsing on {', '.join(failed)}")
+        else:
+            print(f"✅ {name}: {len(batch_result['drivers_updated'])} drivers, same as sequential parsing")
+    
+    return all_ok
+
+
+def test_session_roundtrip():
+    """Test that export -> import -> export keeps the raw data identical"""
+    print("\n💾 Testing session export/import...")
+    
+    parser = KartingMessageParser({"C1": "Classement", "C2": "Kart", "C4": "Dernier T."})
+    parser.parse_batch([
+        "r1c1|in|1\nr1c2|in|25\nr1c4|tn|1:23.456",
+        "r2c1|in|2\nr2c4||1:24.123\nr1c4|tb|1:22.987",
+    ])
+    
+    # JSON round trip, as with a persisted session file (tuples come back as lists)
+    exported = json.loads(json.dumps(parser.export_session_data()))
+    
+    restored = KartingMessageParser()
+    restored.import_session_data(exported)
+    re_exported = json.loads(json.dumps(restored.export_session_data()))
+    
+    ok = restored.raw_data == parser.raw_data and re_exported['raw_data'] == exported['raw_data']
+    
+    if ok:
+        print(f"✅ Raw data identical after round trip ({len(restored.raw_data)} entries)")
+    else:
+        print("❌ Raw data changed after export/import")
+        print(f"   Before: {exported['raw_data']}")
+        print(f"   After:  {re_exported['raw_data']}")
+    
+    return ok
+
+
+def main():
+    """Run all tests"""
+    print("🏁 Starting karting parser batch tests...")
+    
+    batch_ok = test_batch_parsing()
+    roundtrip_ok = test_session_roundtrip()
+    
+    # Summary
+    print("\n📊 Test Summary:")
+    print(f"   Batch parsing: {'✅' if batch_ok else '❌'}")
+    print(f"   Session round trip: {'✅' if roundtrip_ok else '❌'}")
+    
+    if batch_ok and roundtrip_ok:
+        print("\n🎉 All batch parsing tests passed!")
+    else:
+        print("\n⚠️ Some tests failed.")
+    
+    return batch_ok and roundtrip_ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)